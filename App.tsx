@@ -59,6 +59,8 @@ const App: React.FC = () => {
   const [templates, setTemplates] = useState<SurveyTemplate[]>([]);
   const [responses, setResponses] = useState<SurveyResponse[]>([]);
   const [assignments, setAssignments] = useState<SurveyAssignment[]>([]);
+  // Closed seasons live in the archive tables; only the analytics views need them
+  const [archivedResponses, setArchivedResponses] = useState<SurveyResponse[] | null>(null);
   const [loading, setLoading] = useState(false);
 
   const [activeTab, setActiveTab] = useState('dashboard');
@@ -101,9 +103,24 @@ const App: React.FC = () => {
   };
 
   useEffect(() => {
+    setArchivedResponses(null);
     refreshData();
   }, [currentUser]);
 
+  useEffect(() => {
+    const isAnalyticsTab = ['analytics', 'survey-analytics', 'question-trends'].includes(activeTab);
+    if (currentUser && isAnalyticsTab && archivedResponses === null) {
+      api.get('/responses?archived=true')
+        .then(setArchivedResponses)
+        .catch(err => console.error("Archive fetch error", err));
+    }
+  }, [activeTab, currentUser, archivedResponses]);
+
+  const analyticsResponses = useMemo(
+    () => archivedResponses ? [...archivedResponses, ...responses] : responses,
+    [responses, archivedResponses]
+  );
+
   const sidebarItems = useMemo(() => {
     const items = [
       { id: 'dashboard', label: t.dashboard, icon: <LayoutDashboard className="w-5 h-5" />, roles: [UserRole.ADMIN, UserRole.PLAYER, UserRole.TRAINER, UserRole.GUARDIAN, UserRole.DOCTOR] },
@@ -349,7 +366,7 @@ const App: React.FC = () => {
                 <Analytics 
                   user={currentUser} 
                   users={users} 
-                  responses={responses} 
+                  responses={analyticsResponses} 
                   templates={templates}
                   lang={lang}
                 />
@@ -358,7 +375,7 @@ const App: React.FC = () => {
                 <SurveyAnalytics 
                   users={users} 
                   templates={templates}
-                  responses={responses} 
+                  responses={analyticsResponses} 
                   lang={lang}
                 />
               )}
@@ -366,7 +383,7 @@ const App: React.FC = () => {
                 <QuestionTrends 
                   users={users} 
                   templates={templates}
-                  responses={responses} 
+                  responses={analyticsResponses} 
                   lang={lang}
                 />
               )}
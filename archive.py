@@ -0,0 +1,101 @@
+"""Move closed seasons out of the hot survey tables.
+
+Assignments and responses for every year before --before are moved into
+survey_assignments_archive / survey_responses_archive (one partition per
+season on Postgres). They stay readable through GET /assignments?archived=true
+and GET /responses?archived=true. Rows without a year are left in place.
+
+    python archive.py --before 2025 --dry-run
+    python archive.py --before 2025
+    python archive.py --restore 2023
+"""
+import os
+import argparse
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import select, text, union
+
+
+def _tables():
+    from main import SurveyAssignment, SurveyAssignmentArchive, SurveyResponse, SurveyResponseArchive
+    return [
+        (SurveyAssignment.__table__, SurveyAssignmentArchive.__table__),
+        (SurveyResponse.__table__, SurveyResponseArchive.__table__),
+    ]
+
+
+def _ensure_partition(conn, archive, year: int):
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {archive.name}_y{int(year)} PARTITION OF {archive.name} FOR VALUES IN ({int(year)})"
+    ))
+
+
+def _move(conn, source, target, year: int) -> int:
+    columns = [c.name for c in target.columns]
+    moved = conn.execute(target.insert().from_select(columns, select(*[source.c[name] for name in columns]).where(source.c.year == year))).rowcount
+    conn.execute(source.delete().where(source.c.year == year))
+    return moved
+
+
+def closed_seasons(engine, before: int) -> List[int]:
+    hot = [source for source, _ in _tables()]
+    years = union(*[select(t.c.year).where(t.c.year < before) for t in hot])
+    with engine.connect() as conn:
+        return sorted(row[0] for row in conn.execute(years))
+
+
+def archive_season(engine, year: int) -> Dict[str, int]:
+    counts = {}
+    # One transaction per season: a failed run leaves that season entirely in the hot tables
+    with engine.begin() as conn:
+        for source, archive in _tables():
+            _ensure_partition(conn, archive, year)
+            counts[source.name] = _move(conn, source, archive, year)
+    return counts
+
+
+def restore_season(engine, year: int) -> Dict[str, int]:
+    counts = {}
+    with engine.begin() as conn:
+        for source, archive in _tables():
+            counts[source.name] = _move(conn, archive, source, year)
+    return counts
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="Archive closed FootPulse seasons")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--before", type=int, help="Archive every season older than this year")
+    group.add_argument("--restore", type=int, help="Move one archived season back into the hot tables")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from main import engine
+
+    if args.restore is not None:
+        if args.dry_run:
+            print(f"{args.restore}: would restore")
+            return
+        counts = restore_season(engine, args.restore)
+        print(f"{args.restore}: " + ", ".join(f"{name}={n}" for name, n in counts.items()))
+        return
+    if args.before > datetime.utcnow().year:
+        parser.error("refusing to archive the current season; --before must not be in the future")
+    seasons = closed_seasons(engine, args.before)
+    if not seasons:
+        print("Nothing to archive")
+    for year in seasons:
+        if args.dry_run:
+            print(f"{year}: would archive")
+            continue
+        counts = archive_season(engine, year)
+        print(f"{year}: " + ", ".join(f"{name}={n}" for name, n in counts.items()))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,126 @@
+"""Latency and query-count benchmarks for every route in main.py, per role.
+
+    pip install pytest pytest-benchmark httpx
+    pytest benchmarks                                   # run and print latencies
+    pytest benchmarks --benchmark-save=baseline         # store a timing baseline
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:25%
+    BENCH_UPDATE_BASELINE=1 pytest benchmarks           # rewrite query_baseline.json
+
+A route fails when it issues more SQL statements than recorded in
+query_baseline.json, so N+1 regressions break the build on any machine.
+"""
+import os
+import itertools
+import pytest
+
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "5"))
+ALL_ROLES = ["ADMIN", "TRAINER", "PLAYER", "GUARDIAN", "DOCTOR"]
+_unique = itertools.count()
+
+
+def _actor(club, role):
+    return {
+        "ADMIN": club["admin"],
+        "TRAINER": club["trainers"][0],
+        "PLAYER": club["players"][0],
+        "GUARDIAN": club["guardians"][0],
+        "DOCTOR": club["doctors"][0],
+    }.get(role)
+
+
+def _insert(main, obj):
+    db = main.SessionLocal()
+    try:
+        db.add(obj)
+        db.commit()
+        return obj.id
+    finally:
+        db.close()
+
+
+def _template_body(n):
+    return {"name": f"Bench {n}", "arName": f"Bench {n}", "description": "", "arDescription": "", "categories": []}
+
+
+def _assignment_body(club):
+    return {"template_id": club["templates"][0], "month": "01", "year": 2023, "week": 1, "bulk_type": "PLAYERS_TO_COACHES"}
+
+
+# (roles, method, route, prepare) where prepare(main, club) -> (path, json body)
+CASES = [
+    (["PLAYER"], "POST", "/auth/login", lambda m, c: ("/auth/login", {"email": "player1@club.test", "password": "password"})),
+    (ALL_ROLES, "GET", "/users", lambda m, c: ("/users", None)),
+    (["ADMIN"], "POST", "/users", lambda m, c: ("/users", {
+        "name": "Bench", "email": f"bench{next(_unique)}@club.test", "password": "password", "mobile": "0", "role": "PLAYER"
+    })),
+    (["ADMIN"], "PATCH", "/users/{user_id}", lambda m, c: (f"/users/{c['players'][0]}", {"name": "Player 1"})),
+    (["PLAYER"], "PATCH", "/users/me/password", lambda m, c: ("/users/me/password", {"currentPassword": "password", "newPassword": "password"})),
+    (["ADMIN"], "PATCH", "/users/{user_id}/reset-password", lambda m, c: (f"/users/{c['players'][1]}/reset-password", {"new_password": "password"})),
+    (ALL_ROLES, "GET", "/templates", lambda m, c: ("/templates", None)),
+    (["ADMIN"], "POST", "/templates", lambda m, c: ("/templates", _template_body(next(_unique)))),
+    (["ADMIN"], "PUT", "/templates/{template_id}", lambda m, c: (f"/templates/{c['templates'][-1]}", _template_body("updated"))),
+    (["ADMIN"], "DELETE", "/templates/{template_id}", lambda m, c: (
+        f"/templates/{_insert(m, m.SurveyTemplateModel(id=f't-bench{next(_unique)}', name='x', categories=[]))}", None
+    )),
+    (ALL_ROLES, "GET", "/assignments", lambda m, c: ("/assignments", None)),
+    (["ADMIN"], "POST", "/assignments/preview", lambda m, c: ("/assignments/preview", _assignment_body(c))),
+    (["ADMIN"], "POST", "/assignments", lambda m, c: ("/assignments", _assignment_body(c))),
+    (["ADMIN"], "DELETE", "/assignments/{assignment_id}", lambda m, c: (
+        f"/assignments/{_insert(m, m.SurveyAssignment(id=f'a-bench{next(_unique)}', template_id=c['templates'][0], respondent_id=c['players'][0], target_id=c['trainers'][0], month='12', year=2099, week=1))}", None
+    )),
+    (ALL_ROLES, "GET", "/responses", lambda m, c: ("/responses", None)),
+    (["PLAYER"], "POST", "/responses", lambda m, c: ("/responses", {
+        "template_id": c["templates"][0], "target_player_id": c["trainers"][0], "month": "01", "year": 2023, "week": 1,
+        "answers": {}, "weighted_score": 50
+    })),
+    (["ADMIN"], "DELETE", "/responses/{response_id}", lambda m, c: (
+        f"/responses/{_insert(m, m.SurveyResponse(id=f'sr-bench{next(_unique)}', template_id=c['templates'][0], user_id=c['players'][0], target_player_id=c['trainers'][0], month='01', year=2023, week=1, answers={}, weighted_score=0))}", None
+    )),
+    (["ADMIN", "TRAINER"], "GET", "/training-sessions", lambda m, c: ("/training-sessions", None)),
+    (["TRAINER"], "POST", "/training-sessions", lambda m, c: ("/training-sessions", {"date": "2023-06-01T17:00:00", "player_ids": c["players"][:2]})),
+    (["ADMIN", "TRAINER"], "GET", "/training-sessions/{session_id}", lambda m, c: (f"/training-sessions/{c['sessions'][0]}", None)),
+    (["TRAINER"], "PATCH", "/training-sessions/{session_id}", lambda m, c: (f"/training-sessions/{c['sessions'][1]}", {"date": "2023-01-03T17:00:00", "player_ids": c["players"][:3]})),
+    (["TRAINER"], "DELETE", "/training-sessions/{session_id}", lambda m, c: (
+        f"/training-sessions/{_insert(m, m.TrainingSession(id=f'ts-bench{next(_unique)}', trainer_id=c['trainers'][0], player_ids=[]))}", None
+    )),
+    (["TRAINER"], "POST", "/training-sessions/{session_id}/evaluations", lambda m, c: (
+        f"/training-sessions/{c['sessions'][0]}/evaluations", {"player_id": c["players"][0], "rating": 7}
+    )),
+    (["ADMIN", "TRAINER"], "GET", "/players/{player_id}/training-evaluations", lambda m, c: (f"/players/{c['players'][0]}/training-evaluations", None)),
+    (["ADMIN", "TRAINER", "DOCTOR"], "GET", "/analytics/leaderboard", lambda m, c: ("/analytics/leaderboard?metric=improvement&k=10", None)),
+    (ALL_ROLES, "POST", "/events/ticket", lambda m, c: ("/events/ticket", None)),
+    ([None], "GET", "/metrics", lambda m, c: ("/metrics", None)),
+]
+
+PARAMS = [
+    pytest.param(role, method, route, prepare, id=f"{role or 'ANON'} {method} {route}")
+    for roles, method, route, prepare in CASES for role in roles
+]
+
+
+@pytest.mark.parametrize("role,method,route,prepare", PARAMS)
+def test_endpoint(benchmark, app_main, club, client, auth_headers, query_baseline, count_queries, role, method, route, prepare):
+    actor = _actor(club, role)
+    headers = auth_headers(actor) if actor else {}
+    query_counts = []
+
+    def setup():
+        path, body = prepare(app_main, club)
+        count_queries["n"] = 0
+        return (path, body), {}
+
+    def call(path, body):
+        response = client.request(method, path, json=body, headers=headers)
+        query_counts.append(count_queries["n"])
+        assert response.status_code < 400, response.text
+        return response
+
+    benchmark.pedantic(call, setup=setup, rounds=ROUNDS, iterations=1)
+
+    key = f"{role or 'ANON'} {method} {route}"
+    queries = max(query_counts)
+    benchmark.extra_info["sql_queries"] = queries
+    baseline, observed = query_baseline
+    observed[key] = queries
+    if key in baseline:
+        assert queries <= baseline[key], f"{key} issued {queries} SQL statements, baseline is {baseline[key]}"
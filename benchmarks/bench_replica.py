@@ -0,0 +1,122 @@
+"""Read replica routing against two SQLite files.
+
+The replica is a snapshot of the bench database taken when each test starts,
+so anything written afterwards is only visible when a request is routed to
+the primary.
+
+    pytest benchmarks/bench_replica.py
+"""
+import sqlite3
+import itertools
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+_unique = itertools.count()
+
+
+def _clear_pins(main):
+    with main.engine.begin() as conn:
+        conn.execute(main.ReplicaPin.__table__.delete())
+
+
+@pytest.fixture
+def replica(app_main, club, tmp_path, monkeypatch):
+    path = str(tmp_path / "replica.db")
+    source, target = sqlite3.connect(app_main.engine.url.database), sqlite3.connect(path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    read_engine = create_engine("sqlite:///" + path, connect_args={"check_same_thread": False})
+    monkeypatch.setattr(app_main, "read_engine", read_engine)
+    monkeypatch.setattr(app_main, "ReadSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=read_engine))
+    monkeypatch.setitem(app_main._replica_state, "healthy", False)
+    monkeypatch.setitem(app_main._replica_state, "checked_at", float("-inf"))
+    _clear_pins(app_main)
+    app_main.invalidate_scopes()
+    yield SimpleNamespace(engine=read_engine)
+    read_engine.dispose()
+    _clear_pins(app_main)
+    app_main.invalidate_scopes()
+
+
+def _primary_only_template(main):
+    db = main.SessionLocal()
+    try:
+        template = main.SurveyTemplateModel(id=f"t-replica{next(_unique)}", name="Primary only", categories=[])
+        db.add(template)
+        db.commit()
+        return template.id
+    finally:
+        db.close()
+
+
+def _template_ids(client):
+    response = client.get("/templates")
+    assert response.status_code == 200, response.text
+    return {t["id"] for t in response.json()}
+
+
+def _drop(replica, table):
+    with replica.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {table}"))
+
+
+def test_get_is_served_by_replica(app_main, client, replica):
+    template_id = _primary_only_template(app_main)
+    assert template_id not in _template_ids(client)
+    assert app_main._replica_state["healthy"]
+
+
+def test_writer_reads_own_writes(app_main, club, client, auth_headers, replica):
+    admin, trainer = auth_headers(club["admin"]), auth_headers(club["trainers"][0])
+    player_id = club["players"][0]
+    try:
+        assert client.patch(f"/users/{player_id}", json={"name": "Renamed"}, headers=admin).status_code == 200
+        names = {u["id"]: u["name"] for u in client.get("/users", headers=admin).json()}
+        assert names[player_id] == "Renamed"
+        # Other clients keep reading the lagging replica
+        names = {u["id"]: u["name"] for u in client.get("/users", headers=trainer).json()}
+        assert names[player_id] == "Player 1"
+    finally:
+        client.patch(f"/users/{player_id}", json={"name": "Player 1"}, headers=admin)
+
+
+def test_pin_from_another_worker_is_honoured(app_main, club, client, auth_headers, replica):
+    template_id = _primary_only_template(app_main)
+    # Another process took this client's write and left only the shared pin behind
+    with app_main.engine.begin() as conn:
+        conn.execute(app_main.ReplicaPin.__table__.insert(), {"client_key": "admin1@club.test", "until": datetime.utcnow() + timedelta(seconds=5)})
+    ids = {t["id"] for t in client.get("/templates", headers=auth_headers(club["admin"])).json()}
+    assert template_id in ids
+
+
+def test_scope_is_resolved_on_primary(app_main, club, client, auth_headers, replica):
+    admin, doctor_id = auth_headers(club["admin"]), club["doctors"][0]
+    served = [p for i, p in enumerate(club["players"]) if i % len(club["doctors"]) == 0]
+    try:
+        assert client.patch(f"/users/{doctor_id}", json={"player_ids": []}, headers=admin).status_code == 200
+        users = client.get("/users", headers=auth_headers(doctor_id)).json()
+        assert {u["id"] for u in users} == {doctor_id}
+    finally:
+        client.patch(f"/users/{doctor_id}", json={"player_ids": served}, headers=admin)
+
+
+def test_unhealthy_replica_is_skipped(app_main, client, replica):
+    _drop(replica, "users")
+    template_id = _primary_only_template(app_main)
+    assert template_id in _template_ids(client)
+    assert not app_main._replica_state["healthy"]
+
+
+def test_failing_replica_is_retried_on_primary(app_main, client, replica, monkeypatch):
+    monkeypatch.setattr(app_main, "REPLICA_HEALTH_INTERVAL", 3600)
+    assert app_main.replica_available()
+    _drop(replica, "survey_templates")
+    template_id = _primary_only_template(app_main)
+    assert template_id in _template_ids(client)
+    assert not app_main._replica_state["healthy"]
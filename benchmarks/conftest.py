@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERY_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_baseline.json")
+
+# Club size used for the run; the stored query baseline is only valid for the defaults
+BENCH_SCALE = {
+    "trainers": int(os.getenv("BENCH_TRAINERS", "4")),
+    "players": int(os.getenv("BENCH_PLAYERS", "60")),
+    "guardians": int(os.getenv("BENCH_GUARDIANS", "60")),
+    "doctors": int(os.getenv("BENCH_DOCTORS", "2")),
+    "templates": int(os.getenv("BENCH_TEMPLATES", "3")),
+    "years": int(os.getenv("BENCH_YEARS", "1")),
+}
+UPDATE_BASELINE = os.getenv("BENCH_UPDATE_BASELINE") == "1"
+OBSERVED_QUERIES = {}
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not OBSERVED_QUERIES:
+        return
+    terminalreporter.section("sql statements per request")
+    for key, count in sorted(OBSERVED_QUERIES.items()):
+        terminalreporter.write_line(f"{count:>8}  {key}")
+
+
+@pytest.fixture(scope="session")
+def app_main():
+    # main.py binds its engine at import time, so point it at a throwaway SQLite file first
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="footpulse-bench-"), "bench.db")
+    sys.path.insert(0, ROOT)
+    import main
+    return main
+
+
+@pytest.fixture(scope="session")
+def club(app_main):
+    import seed
+    db = app_main.SessionLocal()
+    try:
+        return seed.generate_club(db, **BENCH_SCALE)
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def client(app_main, club):
+    from fastapi.testclient import TestClient
+    return TestClient(app_main.app)
+
+
+@pytest.fixture(scope="session")
+def auth_headers(app_main, club):
+    db = app_main.SessionLocal()
+    try:
+        users = {u.id: u.email for u in db.query(app_main.User).all()}
+    finally:
+        db.close()
+    def headers(user_id):
+        return {"Authorization": f"Bearer {app_main.create_access_token({'sub': users[user_id]})}"}
+    return headers
+
+
+@pytest.fixture(scope="session")
+def query_baseline():
+    baseline = {}
+    if os.path.exists(QUERY_BASELINE):
+        with open(QUERY_BASELINE) as f:
+            baseline = json.load(f)
+    yield baseline, OBSERVED_QUERIES
+    if UPDATE_BASELINE and OBSERVED_QUERIES:
+        with open(QUERY_BASELINE, "w") as f:
+            json.dump(dict(sorted(OBSERVED_QUERIES.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture
+def count_queries(app_main):
+    from sqlalchemy import event
+    counter = {"n": 0}
+    def on_execute(*args):
+        counter["n"] += 1
+    event.listen(app_main.engine, "after_cursor_execute", on_execute)
+    yield counter
+    event.remove(app_main.engine, "after_cursor_execute", on_execute)
@@ -1,11 +1,25 @@
 
 import os
+import json
+import time
+import heapq
+import asyncio
+import logging
+import secrets
+import threading
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, Depends, HTTPException, status
+from typing import List, Optional, Dict, Any, FrozenSet, NamedTuple
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, JSON, DateTime, Boolean, Enum as SQLEnum, text, or_, and_, inspect
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, ForeignKey, JSON, DateTime, Boolean, Enum as SQLEnum, text, or_, and_, inspect, select, func, case, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from passlib.context import CryptContext
@@ -20,14 +34,40 @@ if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
 if not DATABASE_URL:
     DATABASE_URL = "sqlite:///./footpulse.db"
 
+# Optional read replica for GET routes
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+if DATABASE_READ_URL and DATABASE_READ_URL.startswith("postgres://"):
+    DATABASE_READ_URL = DATABASE_READ_URL.replace("postgres://", "postgresql://", 1)
+# After a write, the same user reads from the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# How often (seconds) the replica is probed; an unhealthy replica is skipped until the next probe
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "10"))
+
 SECRET_KEY = os.getenv("SECRET_KEY", "FOOTBALL_DNA_SECRET_KEY_CHANGE_IN_PROD")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
+# Statements slower than this (milliseconds) are written to the slow query log
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Upper bound (seconds) on how stale a cached visibility scope can be in another worker process
+SCOPE_CACHE_TTL = float(os.getenv("SCOPE_CACHE_TTL", "60"))
+
+# Change feed (/events): events kept for Last-Event-ID replay, per-client buffer and keepalive period
+EVENT_BACKLOG = int(os.getenv("EVENT_BACKLOG", "1000"))
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "1000"))
+EVENT_KEEPALIVE_SECONDS = float(os.getenv("EVENT_KEEPALIVE_SECONDS", "15"))
+EVENT_TICKET_SECONDS = int(os.getenv("EVENT_TICKET_SECONDS", "30"))
+
 # --- DB SETUP ---
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 engine = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+read_engine = None
+ReadSessionLocal = None
+if DATABASE_READ_URL:
+    read_connect_args = {"check_same_thread": False} if DATABASE_READ_URL.startswith("sqlite") else {}
+    read_engine = create_engine(DATABASE_READ_URL, connect_args=read_connect_args, pool_pre_ping=True)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 # --- MODELS ---
@@ -70,7 +110,7 @@ class SurveyAssignment(Base):
     respondent_id = Column(String, ForeignKey("users.id"))
     target_id = Column(String)
     month = Column(String)
-    year = Column(Integer, nullable=True)
+    year = Column(Integer, nullable=True, index=True)
     week = Column(Integer, nullable=True)
     status = Column(String, default='PENDING')
 
@@ -81,12 +121,41 @@ class SurveyResponse(Base):
     user_id = Column(String, ForeignKey("users.id"))
     target_player_id = Column(String)
     month = Column(String)
-    year = Column(Integer, nullable=True)
+    year = Column(Integer, nullable=True, index=True)
     week = Column(Integer, nullable=True)
     date = Column(DateTime, default=datetime.utcnow)
     answers = Column(JSON)
     weighted_score = Column(Float)
 
+# Closed seasons moved out of the hot tables by archive.py. On Postgres these are
+# partitioned by year; each season gets its own partition when it is archived.
+class SurveyAssignmentArchive(Base):
+    __tablename__ = "survey_assignments_archive"
+    __table_args__ = {"postgresql_partition_by": "LIST (year)"}
+    id = Column(String, primary_key=True)
+    template_id = Column(String)
+    assigner_id = Column(String)
+    respondent_id = Column(String, index=True)
+    target_id = Column(String, index=True)
+    month = Column(String)
+    year = Column(Integer, primary_key=True)
+    week = Column(Integer, nullable=True)
+    status = Column(String)
+
+class SurveyResponseArchive(Base):
+    __tablename__ = "survey_responses_archive"
+    __table_args__ = {"postgresql_partition_by": "LIST (year)"}
+    id = Column(String, primary_key=True)
+    template_id = Column(String)
+    user_id = Column(String, index=True)
+    target_player_id = Column(String, index=True)
+    month = Column(String)
+    year = Column(Integer, primary_key=True, index=True)
+    week = Column(Integer, nullable=True)
+    date = Column(DateTime)
+    answers = Column(JSON)
+    weighted_score = Column(Float)
+
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
     id = Column(String, primary_key=True, index=True)
@@ -102,6 +171,11 @@ class TrainingEvaluation(Base):
     rating = Column(Integer)
     comments = Column(String, nullable=True)
 
+class ReplicaPin(Base):
+    __tablename__ = "replica_pins"
+    client_key = Column(String, primary_key=True)
+    until = Column(DateTime, nullable=False)
+
 # --- DB INITIALIZATION ---
 def init_db():
     # Create tables if they don't exist
@@ -142,17 +216,24 @@ def init_db():
                 conn.execute(text("ALTER TABLE survey_responses ADD COLUMN week INTEGER"))
             conn.commit()
 
-    # 4. Handle Postgres Enum update if necessary
-        if DATABASE_URL.startswith("postgresql"):
-            try:
-                with engine.connect() as conn:
-                    # Check if DOCTOR exists in the enum
-                    # This is a bit complex in SQL, but we can try adding it and catch the error if it exists
-                    conn.execute(text("ALTER TYPE userrole ADD VALUE IF NOT EXISTS 'DOCTOR'"))
-                    conn.commit()
-            except Exception:
-                # IF NOT EXISTS is supported in Postgres 9.4+
-                pass
+    # 4. Season indexes on the survey tables (create_all only adds them to new tables)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_survey_assignments_year ON survey_assignments (year)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_survey_responses_year ON survey_responses (year)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_survey_responses_archive_year ON survey_responses_archive (year)"))
+        conn.commit()
+
+    # 5. Handle Postgres Enum update if necessary
+    if DATABASE_URL.startswith("postgresql"):
+        try:
+            with engine.connect() as conn:
+                # Check if DOCTOR exists in the enum
+                # This is a bit complex in SQL, but we can try adding it and catch the error if it exists
+                conn.execute(text("ALTER TYPE userrole ADD VALUE IF NOT EXISTS 'DOCTOR'"))
+                conn.commit()
+        except Exception:
+            # IF NOT EXISTS is supported in Postgres 9.4+
+            pass
 
 init_db()
 
@@ -183,18 +264,197 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_db():
-    db = SessionLocal()
+# --- INSTRUMENTATION ---
+slow_query_log = logging.getLogger("footpulse.slow_query")
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# Per-request counters, filled in by the SQLAlchemy and ORM event hooks below
+_request_stats: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_stats", default=None)
+_route_metrics: Dict[tuple, Dict[str, Any]] = {}
+_route_metrics_lock = threading.Lock()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _request_stats.get()
+    route = stats["route"] if stats else None
+    if stats is not None:
+        stats["sql_queries"] += 1
+        stats["sql_seconds"] += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        if stats is not None: stats["slow_queries"] += 1
+        slow_query_log.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route or "<no request>", statement)
+
+# Counts ORM entities only; column and Core selects (scope lookups, analytics) have no per-row hook
+@event.listens_for(Base, "load", propagate=True)
+def _on_entity_loaded(target, context):
+    stats = _request_stats.get()
+    if stats is not None: stats["entities"] += 1
+
+def record_request(method: str, route: str, duration: float, stats: Dict[str, Any], response_bytes: int):
+    with _route_metrics_lock:
+        m = _route_metrics.setdefault((method, route), {
+            "buckets": [0] * len(LATENCY_BUCKETS), "count": 0, "sum": 0.0,
+            "sql_queries": 0, "sql_seconds": 0.0, "entities": 0, "bytes": 0, "slow_queries": 0
+        })
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound: m["buckets"][i] += 1
+        m["count"] += 1
+        m["sum"] += duration
+        m["sql_queries"] += stats["sql_queries"]
+        m["sql_seconds"] += stats["sql_seconds"]
+        m["entities"] += stats["entities"]
+        m["bytes"] += response_bytes
+        m["slow_queries"] += stats["slow_queries"]
+
+def render_metrics() -> str:
+    counters = [
+        ("footpulse_sql_queries_total", "counter", "SQL statements executed", "sql_queries"),
+        ("footpulse_sql_seconds_total", "counter", "Time spent executing SQL statements", "sql_seconds"),
+        ("footpulse_orm_entities_loaded_total", "counter", "ORM entities loaded (column and Core selects are not counted)", "entities"),
+        ("footpulse_response_bytes_total", "counter", "Response body bytes sent", "bytes"),
+        ("footpulse_slow_queries_total", "counter", "SQL statements slower than SLOW_QUERY_MS", "slow_queries"),
+    ]
+    with _route_metrics_lock:
+        snapshot = {k: dict(v, buckets=list(v["buckets"])) for k, v in _route_metrics.items()}
+    lines = [
+        "# HELP footpulse_request_duration_seconds Request latency per route",
+        "# TYPE footpulse_request_duration_seconds histogram",
+    ]
+    for (method, route), m in sorted(snapshot.items()):
+        labels = f'method="{method}",route="{route}"'
+        for bound, count in zip(LATENCY_BUCKETS, m["buckets"]):
+            lines.append(f'footpulse_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'footpulse_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m["count"]}')
+        lines.append(f'footpulse_request_duration_seconds_sum{{{labels}}} {m["sum"]}')
+        lines.append(f'footpulse_request_duration_seconds_count{{{labels}}} {m["count"]}')
+    for name, kind, help_text, key in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (method, route), m in sorted(snapshot.items()):
+            lines.append(f'{name}{{method="{method}",route="{route}"}} {m[key]}')
+    return "\n".join(lines) + "\n"
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    stats = {"route": request.url.path, "sql_queries": 0, "sql_seconds": 0.0, "entities": 0, "slow_queries": 0}
+    token = _request_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stats.reset(token)
+    duration = time.perf_counter() - start
+    # Label by route template (/users/{user_id}) so metrics don't explode per id
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else "<unmatched>"
+    stats["route"] = route_path
+    if route_path not in ("/metrics", "/events"):
+        record_request(request.method, route_path, duration, stats, int(response.headers.get("content-length", 0)))
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats["sql_seconds"] * 1000:.1f};desc="{stats["sql_queries"]} queries, {stats["entities"]} entities", '
+        f'total;dur={duration * 1000:.1f}'
+    )
+    # The dashboard is served from another origin; let its devtools read the timings
+    response.headers["Timing-Allow-Origin"] = "*"
+    return response
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# --- READ REPLICA ROUTING ---
+replica_log = logging.getLogger("footpulse.replica")
+_replica_state = {"healthy": False, "checked_at": float("-inf")}
+
+def replica_available() -> bool:
+    if read_engine is None:
+        return False
+    now = time.monotonic()
+    if now - _replica_state["checked_at"] >= REPLICA_HEALTH_INTERVAL:
+        _replica_state["checked_at"] = now
+        try:
+            # Probe a real table so an empty or half-restored replica counts as unhealthy
+            with read_engine.connect() as conn:
+                conn.execute(text("SELECT 1 FROM users LIMIT 1"))
+            if not _replica_state["healthy"]: replica_log.info("Read replica is healthy")
+            _replica_state["healthy"] = True
+        except Exception as e:
+            if _replica_state["healthy"]: replica_log.warning("Read replica unavailable, using primary: %s", e)
+            _replica_state["healthy"] = False
+    return _replica_state["healthy"]
+
+def mark_replica_unhealthy():
+    _replica_state["healthy"] = False
+    _replica_state["checked_at"] = time.monotonic()
+
+def _client_key(request: Request) -> Optional[str]:
+    # Only used for routing, so the signature is checked later by get_current_user
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.get_unverified_claims(auth[7:]).get("sub")
+    except JWTError:
+        return None
+
+def _wrote_recently(key: Optional[str]) -> bool:
+    # Pins live on the primary so that every worker sees them, not just the one that took the write
+    if key is None:
+        return False
+    with engine.connect() as conn:
+        until = conn.execute(select(ReplicaPin.until).where(ReplicaPin.client_key == key)).scalar()
+    return until is not None and until > datetime.utcnow()
+
+@event.listens_for(SessionLocal, "before_commit")
+def _pin_writer(session):
+    # Flushed in the same transaction as the write, so the pin exists before the response reaches the client
+    key = session.info.get("client_key")
+    if key and read_engine is not None:
+        session.merge(ReplicaPin(client_key=key, until=datetime.utcnow() + timedelta(seconds=READ_YOUR_WRITES_SECONDS)))
+
+def get_db(request: Request):
+    key = _client_key(request)
+    use_replica = (request.method == "GET" and not getattr(request.state, "replica_failed", False)
+                   and replica_available() and not _wrote_recently(key))
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    db.info["client_key"] = key
+    request.state.used_replica = use_replica
     try:
         yield db
     finally:
         db.close()
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+class ReplicaFallbackRoute(APIRoute):
+    """Re-runs a GET once on the primary when the replica failed mid-request."""
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            try:
+                return await handler(request)
+            except OperationalError as e:
+                if not getattr(request.state, "used_replica", False):
+                    raise
+                mark_replica_unhealthy()
+                request.state.replica_failed = True
+                replica_log.warning("Read replica failed during %s, retrying on primary: %s", request.url.path, e)
+                return await handler(request)
+
+        return route_handler
+
+app.router.route_class = ReplicaFallbackRoute
+
+def user_from_token(token: str, db: Session, purpose: Optional[str] = None) -> User:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        # Access tokens have no purpose claim; single-purpose tickets are only valid where they are expected
+        if email is None or payload.get("purpose") != purpose:
             raise HTTPException(status_code=401, detail="Invalid credentials")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -206,6 +466,162 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
          raise HTTPException(status_code=403, detail="Account is deactivated")
     return user
 
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return user_from_token(token, db)
+
+# --- VISIBILITY SCOPE ---
+class VisibilityScope(NamedTuple):
+    user_ids: FrozenSet[str]     # accounts listed by /users
+    actor_ids: FrozenSet[str]    # surveys answered by these users are visible...
+    subject_ids: FrozenSet[str]  # ...as are surveys about these users
+
+    def allows(self, actor_id: Optional[str], subject_id: Optional[str]) -> bool:
+        # Python twin of scope_filter, for rows that never go through SQL
+        return actor_id in self.actor_ids or subject_id in self.subject_ids
+
+_scope_cache: Dict[str, tuple] = {}
+_scope_cache_lock = threading.Lock()
+# Bumped on every invalidation so long-lived event streams know to re-resolve
+_scope_generation = 0
+
+def resolve_scope(user: User, db: Session) -> VisibilityScope:
+    user_ids = {user.id}
+    actor_ids = {user.id}
+    subject_ids = set()
+    if user.role == UserRole.TRAINER:
+        roster = {row.id for row in db.query(User.id).filter(User.trainer_id == user.id)}
+        user_ids |= roster
+        subject_ids |= roster
+    elif user.role == UserRole.PLAYER:
+        if user.trainer_id: user_ids.add(user.trainer_id)
+        user_ids |= {row.id for row in db.query(User.id).filter(User.player_id == user.id)}
+        subject_ids.add(user.id)
+    elif user.role == UserRole.GUARDIAN:
+        subject_ids.add(user.id)
+        if user.player_id:
+            user_ids.add(user.player_id)
+            actor_ids.add(user.player_id)
+            subject_ids.add(user.player_id)
+            child = db.query(User.trainer_id).filter(User.id == user.player_id).first()
+            if child and child.trainer_id: user_ids.add(child.trainer_id)
+    elif user.role == UserRole.DOCTOR:
+        if user.player_ids:
+            user_ids |= set(user.player_ids)
+            subject_ids |= set(user.player_ids)
+    return VisibilityScope(frozenset(user_ids), frozenset(actor_ids), frozenset(subject_ids))
+
+def invalidate_scopes():
+    # Any user edit can move players between rosters, guardians or doctors, so drop every entry
+    global _scope_generation
+    with _scope_cache_lock:
+        _scope_cache.clear()
+        _scope_generation += 1
+
+def cached_scope(current_user: User, db: Session) -> Optional[VisibilityScope]:
+    # Admins are unrestricted
+    if current_user.role == UserRole.ADMIN:
+        return None
+    now = time.monotonic()
+    with _scope_cache_lock:
+        cached = _scope_cache.get(current_user.id)
+        generation = _scope_generation
+    if cached and now - cached[0] < SCOPE_CACHE_TTL:
+        return cached[1]
+    if read_engine is not None and db.get_bind() is read_engine:
+        # A lagging replica would re-cache the scope invalidate_scopes() just dropped
+        with SessionLocal() as primary:
+            scope = resolve_scope(primary.get(User, current_user.id) or current_user, primary)
+    else:
+        scope = resolve_scope(current_user, db)
+    with _scope_cache_lock:
+        # An invalidation during resolve_scope means this result may already be stale
+        if generation == _scope_generation:
+            _scope_cache[current_user.id] = (now, scope)
+    return scope
+
+def get_user_scope(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> Optional[VisibilityScope]:
+    return cached_scope(current_user, db)
+
+def scope_filter(scope: VisibilityScope, actor_column, subject_column):
+    return or_(actor_column.in_(scope.actor_ids), subject_column.in_(scope.subject_ids))
+
+# --- CHANGE FEED ---
+class ChangeSubscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, scope: Optional[VisibilityScope], generation: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.overflowed = False
+        # Scope as of _scope_generation == generation; the stream refreshes both after an invalidation
+        self.scope = scope
+        self.generation = generation
+
+    def offer(self, event: Dict[str, Any]):
+        # Runs on the subscriber's loop; a client that falls behind is cut off and replays via Last-Event-ID.
+        # Nothing is queued after the first drop, so the last id the client sees always precedes the gap.
+        if self.overflowed:
+            return
+        # Drop what this client can't see before it takes queue space. With a stale scope everything is
+        # queued and the stream filters it again once the scope has been reloaded.
+        if self.scope is not None and self.generation == _scope_generation \
+                and not self.scope.allows(event["actor_id"], event["subject_id"]):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+class ChangeBroker:
+    def __init__(self, backlog: int):
+        self._lock = threading.Lock()
+        self._subscribers: List[ChangeSubscriber] = []
+        self._backlog: deque = deque(maxlen=backlog)
+        self._next_seq = 1
+        # Ids are "<epoch>-<seq>" so an id handed out before a restart is never mistaken for a current one
+        self.epoch = secrets.token_hex(4)
+
+    def publish(self, event_type: str, data: Dict[str, Any], actor_id: Optional[str], subject_id: Optional[str]):
+        with self._lock:
+            seq = self._next_seq
+            event = {"id": f"{self.epoch}-{seq}", "seq": seq, "type": event_type, "data": data,
+                     "actor_id": actor_id, "subject_id": subject_id}
+            self._next_seq += 1
+            self._backlog.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe(sub)
+
+    def _seq_of(self, event_id: str) -> Optional[int]:
+        epoch, _, seq = event_id.partition("-")
+        return int(seq) if epoch == self.epoch and seq.isdigit() else None
+
+    def subscribe(self, scope: Optional[VisibilityScope], generation: int, last_event_id: Optional[str] = None):
+        """Register a subscriber and return it with the events to replay first.
+
+        When the client's Last-Event-ID can't be replayed (it predates the backlog or this process), the
+        replay is a single "reset" event instead; the client must refetch its lists before applying more.
+        """
+        sub = ChangeSubscriber(asyncio.get_running_loop(), scope, generation)
+        with self._lock:
+            self._subscribers.append(sub)
+            if last_event_id is None:
+                return sub, []
+            seq, last_seq = self._seq_of(last_event_id), self._next_seq - 1
+            oldest = self._backlog[0]["seq"] if self._backlog else self._next_seq
+            if seq is None or seq < oldest - 1 or seq > last_seq:
+                return sub, [{"id": f"{self.epoch}-{last_seq}", "seq": last_seq, "type": "reset", "data": {},
+                              "actor_id": None, "subject_id": None}]
+            return sub, [e for e in self._backlog if e["seq"] > seq]
+
+    def unsubscribe(self, sub: ChangeSubscriber):
+        with self._lock:
+            if sub in self._subscribers: self._subscribers.remove(sub)
+
+change_broker = ChangeBroker(EVENT_BACKLOG)
+
 # --- SCHEMAS ---
 class LoginRequest(BaseModel):
     email: str
@@ -357,25 +773,10 @@ def login(req: LoginRequest, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer", "user": map_user(user)}
 
 @app.get("/users")
-def list_users(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if current_user.role == UserRole.ADMIN:
+def list_users(scope: Optional[VisibilityScope] = Depends(get_user_scope), db: Session = Depends(get_db)):
+    if scope is None:
         return [map_user(u) for u in db.query(User).all()]
-    user_ids = {current_user.id}
-    if current_user.role == UserRole.TRAINER:
-        roster = db.query(User).filter(User.trainer_id == current_user.id).all()
-        for u in roster: user_ids.add(u.id)
-    elif current_user.role == UserRole.PLAYER:
-        if current_user.trainer_id: user_ids.add(current_user.trainer_id)
-        guardians = db.query(User).filter(User.player_id == current_user.id).all()
-        for g in guardians: user_ids.add(g.id)
-    elif current_user.role == UserRole.GUARDIAN and current_user.player_id:
-        user_ids.add(current_user.player_id)
-        child = db.query(User).filter(User.id == current_user.player_id).first()
-        if child and child.trainer_id: user_ids.add(child.trainer_id)
-    elif current_user.role == UserRole.DOCTOR:
-        if current_user.player_ids:
-            for p_id in current_user.player_ids: user_ids.add(p_id)
-    users = db.query(User).filter(User.id.in_(list(user_ids)), User.is_active == True).all()
+    users = db.query(User).filter(User.id.in_(scope.user_ids), User.is_active == True).all()
     return [map_user(u) for u in users]
 
 @app.post("/users")
@@ -398,6 +799,7 @@ def create_user(user_data: UserCreate, current_user: User = Depends(get_current_
     )
     db.add(db_user)
     db.commit()
+    invalidate_scopes()
     db.refresh(db_user)
     return map_user(db_user)
 
@@ -417,6 +819,7 @@ def update_user(user_id: str, data: UserUpdate, current_user: User = Depends(get
     if data.position is not None: user.position = data.position or None
     if data.is_active is not None: user.is_active = data.is_active
     db.commit()
+    invalidate_scopes()
     return map_user(user)
 
 @app.patch("/users/me/password")
@@ -483,44 +886,15 @@ def delete_template(template_id: str, current_user: User = Depends(get_current_u
     return {"message": "Deleted"}
 
 @app.get("/assignments")
-def get_assignments(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if current_user.role == UserRole.ADMIN:
-        return [map_assignment(a) for a in db.query(SurveyAssignment).all()]
-    
-    # Specific filtering for non-admins
-    if current_user.role == UserRole.TRAINER:
-        # Trainer sees: Their own assignments OR guardian assignments for players they coach
-        assignments = db.query(SurveyAssignment).all()
-        results = []
-        for a in assignments:
-            if a.respondent_id == current_user.id:
-                results.append(a)
-            else:
-                resp = db.query(User).filter(User.id == a.respondent_id).first()
-                target = db.query(User).filter(User.id == a.target_id).first()
-                if resp and resp.role == UserRole.GUARDIAN and target and target.trainer_id == current_user.id:
-                    results.append(a)
-        return [map_assignment(a) for a in results]
-    
-    if current_user.role == UserRole.DOCTOR:
-        # Doctor sees: Their own assignments OR assignments for players they serve
-        assignments = db.query(SurveyAssignment).all()
-        results = []
-        for a in assignments:
-            if a.respondent_id == current_user.id:
-                results.append(a)
-            elif current_user.player_ids and a.target_id in current_user.player_ids:
-                results.append(a)
-        return [map_assignment(a) for a in results]
-    
-    return [map_assignment(a) for a in db.query(SurveyAssignment).filter(
-        or_(
-            SurveyAssignment.respondent_id == current_user.id,
-            SurveyAssignment.target_id == current_user.id,
-            (SurveyAssignment.respondent_id == current_user.player_id if current_user.role == UserRole.GUARDIAN else False),
-            (SurveyAssignment.target_id == current_user.player_id if current_user.role == UserRole.GUARDIAN else False)
-        )
-    ).all()]
+def get_assignments(year: Optional[int] = None, archived: bool = False, scope: Optional[VisibilityScope] = Depends(get_user_scope), db: Session = Depends(get_db)):
+    # archived=true reads the closed seasons moved out by archive.py instead of the hot table
+    model = SurveyAssignmentArchive if archived else SurveyAssignment
+    query = db.query(model)
+    if year is not None:
+        query = query.filter(model.year == year)
+    if scope is not None:
+        query = query.filter(scope_filter(scope, model.respondent_id, model.target_id))
+    return [map_assignment(a) for a in query.all()]
 
 @app.post("/assignments/preview")
 def preview_bulk_assignments(data: AssignmentCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -589,13 +963,16 @@ def create_assignments(data: AssignmentCreate, current_user: User = Depends(get_
     elif data.respondent_ids and data.target_ids:
         for r in data.respondent_ids:
             for t in data.target_ids: pairs.append((r, t))
-    new_count = 0
+    created = []
     for r_id, t_id in pairs:
         if not db.query(SurveyAssignment).filter(SurveyAssignment.template_id == data.template_id, SurveyAssignment.respondent_id == r_id, SurveyAssignment.target_id == t_id, SurveyAssignment.month == data.month, SurveyAssignment.year == data.year, SurveyAssignment.week == data.week).first():
-            db.add(SurveyAssignment(id=f"a-{os.urandom(4).hex()}", template_id=data.template_id, assigner_id=current_user.id, respondent_id=r_id, target_id=t_id, month=data.month, year=data.year, week=data.week))
-            new_count += 1
+            a = SurveyAssignment(id=f"a-{os.urandom(4).hex()}", template_id=data.template_id, assigner_id=current_user.id, respondent_id=r_id, target_id=t_id, month=data.month, year=data.year, week=data.week, status='PENDING')
+            db.add(a)
+            created.append(map_assignment(a))
     db.commit()
-    return {"count": new_count}
+    for a in created:
+        change_broker.publish("assignment.created", a, a["respondentId"], a["targetId"])
+    return {"count": len(created)}
 
 @app.delete("/assignments/{assignment_id}")
 def delete_assignment(assignment_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -603,45 +980,20 @@ def delete_assignment(assignment_id: str, current_user: User = Depends(get_curre
         raise HTTPException(status_code=403, detail="Admin only")
     a = db.query(SurveyAssignment).filter(SurveyAssignment.id == assignment_id).first()
     if a:
+        payload = map_assignment(a)
         db.delete(a); db.commit()
+        change_broker.publish("assignment.deleted", payload, payload["respondentId"], payload["targetId"])
     return {"message": "Deleted"}
 
 @app.get("/responses")
-def get_responses(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if current_user.role == UserRole.ADMIN:
-        return [map_response(r) for r in db.query(SurveyResponse).all()]
-    
-    if current_user.role == UserRole.TRAINER:
-        responses = db.query(SurveyResponse).all()
-        results = []
-        for r in responses:
-            if r.user_id == current_user.id:
-                results.append(r)
-            else:
-                target = db.query(User).filter(User.id == r.target_player_id).first()
-                if target and target.trainer_id == current_user.id:
-                    results.append(r)
-        return [map_response(r) for r in results]
-    
-    if current_user.role == UserRole.DOCTOR:
-        # Doctor sees: Their own responses OR responses for players they serve
-        responses = db.query(SurveyResponse).all()
-        results = []
-        for r in responses:
-            if r.user_id == current_user.id:
-                results.append(r)
-            elif current_user.player_ids and r.target_player_id in current_user.player_ids:
-                results.append(r)
-        return [map_response(r) for r in results]
-    
-    return [map_response(r) for r in db.query(SurveyResponse).filter(
-        or_(
-            SurveyResponse.user_id == current_user.id,
-            SurveyResponse.target_player_id == current_user.id,
-            (SurveyResponse.user_id == current_user.player_id if current_user.role == UserRole.GUARDIAN else False),
-            (SurveyResponse.target_player_id == current_user.player_id if current_user.role == UserRole.GUARDIAN else False)
-        )
-    ).all()]
+def get_responses(year: Optional[int] = None, archived: bool = False, scope: Optional[VisibilityScope] = Depends(get_user_scope), db: Session = Depends(get_db)):
+    model = SurveyResponseArchive if archived else SurveyResponse
+    query = db.query(model)
+    if year is not None:
+        query = query.filter(model.year == year)
+    if scope is not None:
+        query = query.filter(scope_filter(scope, model.user_id, model.target_player_id))
+    return [map_response(r) for r in query.all()]
 
 @app.post("/responses")
 def submit_response(res: SurveySubmit, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -659,8 +1011,13 @@ def submit_response(res: SurveySubmit, current_user: User = Depends(get_current_
     )
     db.add(db_res)
     if assignment: assignment.status = 'COMPLETED'
+    updated = map_assignment(assignment) if assignment else None
     db.commit()
-    return map_response(db_res)
+    result = map_response(db_res)
+    change_broker.publish("response.created", result, db_res.user_id, db_res.target_player_id)
+    if updated:
+        change_broker.publish("assignment.updated", updated, updated["respondentId"], updated["targetId"])
+    return result
 
 @app.delete("/responses/{response_id}")
 def delete_response(response_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -670,7 +1027,11 @@ def delete_response(response_id: str, current_user: User = Depends(get_current_u
     if r:
         assignment = db.query(SurveyAssignment).filter(SurveyAssignment.template_id == r.template_id, SurveyAssignment.respondent_id == r.user_id, SurveyAssignment.target_id == r.target_player_id, SurveyAssignment.month == r.month, SurveyAssignment.year == r.year, SurveyAssignment.week == r.week).first()
         if assignment: assignment.status = 'PENDING'
+        events = [("response.deleted", map_response(r), r.user_id, r.target_player_id)]
+        if assignment:
+            events.append(("assignment.updated", map_assignment(assignment), assignment.respondent_id, assignment.target_id))
         db.delete(r); db.commit()
+        for event in events: change_broker.publish(*event)
     return {"message": "Deleted"}
 
 # --- TRAINING SESSION ROUTES ---
@@ -756,6 +1117,7 @@ def submit_training_evaluation(session_id: str, data: TrainingEvaluationSubmit,
     if data.player_id not in session.player_ids:
         raise HTTPException(status_code=400, detail="Player not in session")
     
+    trainer_id = session.trainer_id
     # Check if evaluation already exists
     evaluation = db.query(TrainingEvaluation).filter(
         TrainingEvaluation.training_session_id == session_id,
@@ -777,13 +1139,16 @@ def submit_training_evaluation(session_id: str, data: TrainingEvaluationSubmit,
     
     db.commit()
     db.refresh(evaluation)
-    return {
+    result = {
         "id": evaluation.id,
         "trainingSessionId": evaluation.training_session_id,
         "playerId": evaluation.player_id,
         "rating": evaluation.rating,
         "comments": evaluation.comments
     }
+    # Training data is only exposed to admins and the session's trainer, so leave the player out of the scope check
+    change_broker.publish("training.evaluation_saved", result, trainer_id, None)
+    return result
 
 @app.get("/players/{player_id}/training-evaluations")
 def get_player_training_evaluations(player_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -807,4 +1172,227 @@ def get_player_training_evaluations(player_id: str, current_user: User = Depends
             "date": e.date.isoformat()
         } for e in evaluations
     ]
-    
\ No newline at end of file
+
+# --- ANALYTICS ROUTES ---
+
+LEADERBOARD_MAX_K = 100
+BAND_PERCENTILES = [10, 25, 50, 75, 90]
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    # Linear interpolation between closest ranks, same as Postgres percentile_cont
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * pct / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return round(sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo), 2)
+
+def _bands(values: List[float]) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+    return {f"p{p}": _percentile(ordered, p) for p in BAND_PERCENTILES}
+
+def _previous_period(period: str, year: int, month: Optional[str]):
+    if period == "year":
+        return year - 1, None
+    m = int(month)
+    return (year - 1, "12") if m == 1 else (year, f"{m - 1:02d}")
+
+def _all_responses(columns: List[str], where):
+    # Periods may straddle an archived season, so read the hot and archive tables together
+    tables = (SurveyResponse.__table__, SurveyResponseArchive.__table__)
+    return union_all(*[select(*[t.c[name] for name in columns]).where(where(t)) for t in tables]).subquery()
+
+def _latest_response_value(db: Session, column: str, where):
+    # max() per table walks the year index, so the lookup never reads or sorts whole seasons
+    tables = (SurveyResponse.__table__, SurveyResponseArchive.__table__)
+    maxima = union_all(*[select(func.max(t.c[column]).label("value")).where(where(t)) for t in tables]).subquery()
+    return db.execute(select(func.max(maxima.c.value))).scalar()
+
+@app.get("/analytics/leaderboard")
+def get_leaderboard(metric: str = "score", order: str = "top", k: int = 10, period: str = "month",
+                    year: Optional[int] = None, month: Optional[str] = None,
+                    trainer_id: Optional[str] = None, position: Optional[str] = None, template_id: Optional[str] = None,
+                    scope: Optional[VisibilityScope] = Depends(get_user_scope), db: Session = Depends(get_db)):
+    if metric not in ("score", "improvement"):
+        raise HTTPException(status_code=400, detail="metric must be 'score' or 'improvement'")
+    if order not in ("top", "bottom"):
+        raise HTTPException(status_code=400, detail="order must be 'top' or 'bottom'")
+    if period not in ("month", "year"):
+        raise HTTPException(status_code=400, detail="period must be 'month' or 'year'")
+    if month is not None and not (month.isdigit() and 1 <= int(month) <= 12):
+        raise HTTPException(status_code=400, detail="month must be 01-12")
+    k = max(1, min(k, LEADERBOARD_MAX_K))
+
+    month = f"{int(month):02d}" if period == "month" and month else None
+    # Default to the most recent period with data: the latest season first, then the latest month inside it
+    if year is None:
+        year = _latest_response_value(db, "year", lambda t: t.c.month == month if month else t.c.year.isnot(None))
+    if year is not None and period == "month" and month is None:
+        month = _latest_response_value(db, "month", lambda t: t.c.year == year)
+    # Without any responses there is no period to rank; the response keeps its shape with empty results
+    resolved = year is not None and (period == "year" or month is not None)
+    prev_year, prev_month = _previous_period(period, year, month) if resolved else (None, None)
+
+    src = _all_responses(["target_player_id", "template_id", "year", "month", "weighted_score"],
+                         lambda t: t.c.year.in_({year, prev_year}))
+    is_current = src.c.year == year if month is None else and_(src.c.year == year, src.c.month == month)
+    is_previous = src.c.year == prev_year if prev_month is None else and_(src.c.year == prev_year, src.c.month == prev_month)
+
+    filters = [or_(is_current, is_previous), User.role == UserRole.PLAYER]
+    if template_id: filters.append(src.c.template_id == template_id)
+    if trainer_id: filters.append(User.trainer_id == trainer_id)
+    if position: filters.append(User.position == position)
+    if scope is not None: filters.append(src.c.target_player_id.in_(scope.subject_ids))
+
+    per_player = select(
+        User.id.label("player_id"), User.name, User.trainer_id, User.position,
+        func.avg(case((is_current, src.c.weighted_score))).label("score"),
+        func.avg(case((is_previous, src.c.weighted_score))).label("previous_score"),
+        func.count(case((is_current, 1))).label("responses"),
+    ).select_from(src.join(User, User.id == src.c.target_player_id)).where(*filters) \
+        .group_by(User.id, User.name, User.trainer_id, User.position).subquery()
+    ranked = select(
+        per_player,
+        (per_player.c.score - per_player.c.previous_score).label("delta"),
+        func.percent_rank().over(order_by=per_player.c.score).label("percentile"),
+    ).where(per_player.c.score.isnot(None))
+    rows = db.execute(ranked).all() if resolved else []
+
+    # One row per player, so top-k is a heap pass rather than sorting every response
+    candidates = rows if metric == "score" else [r for r in rows if r.delta is not None]
+    value = (lambda r: (r.score, r.player_id)) if metric == "score" else (lambda r: (r.delta, r.player_id))
+    picked = heapq.nlargest(k, candidates, key=value) if order == "top" else heapq.nsmallest(k, candidates, key=value)
+
+    squads: Dict[Optional[str], List[Any]] = {}
+    for r in rows: squads.setdefault(r.trainer_id, []).append(r)
+    cohorts = []
+    for squad_trainer_id, members in squads.items():
+        deltas = [m.delta for m in members if m.delta is not None]
+        cohorts.append({
+            "trainerId": squad_trainer_id,
+            "players": len(members),
+            "meanScore": round(sum(m.score for m in members) / len(members), 2),
+            "meanDelta": round(sum(deltas) / len(deltas), 2) if deltas else None,
+            "score": _bands([m.score for m in members]),
+            "delta": _bands(deltas)
+        })
+    cohorts.sort(key=lambda c: c["meanScore"], reverse=True)
+
+    return {
+        "period": {
+            "type": period,
+            "current": {"year": year, "month": month},
+            "previous": {"year": prev_year, "month": prev_month}
+        },
+        "metric": metric,
+        "order": order,
+        "k": k,
+        "players": [
+            {
+                "rank": i + 1,
+                "playerId": r.player_id,
+                "name": r.name,
+                "trainerId": r.trainer_id,
+                "position": r.position,
+                "score": round(r.score, 2),
+                "previousScore": round(r.previous_score, 2) if r.previous_score is not None else None,
+                "delta": round(r.delta, 2) if r.delta is not None else None,
+                "responses": r.responses,
+                "percentile": round(r.percentile * 100, 1)
+            } for i, r in enumerate(picked)
+        ],
+        "bands": {
+            "score": _bands([r.score for r in rows]),
+            "delta": _bands([r.delta for r in rows if r.delta is not None])
+        },
+        "cohorts": cohorts
+    }
+
+# --- CHANGE FEED ROUTES ---
+STREAM_TICKET_PURPOSE = "events"
+_used_tickets: Dict[str, float] = {}
+_used_tickets_lock = threading.Lock()
+
+def create_stream_ticket(user: User) -> str:
+    expire = datetime.utcnow() + timedelta(seconds=EVENT_TICKET_SECONDS)
+    claims = {"sub": user.email, "purpose": STREAM_TICKET_PURPOSE, "jti": secrets.token_urlsafe(16), "exp": expire}
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+def _redeem_ticket(ticket: str):
+    claims = jwt.get_unverified_claims(ticket)
+    now = time.time()
+    with _used_tickets_lock:
+        for jti in [jti for jti, exp in _used_tickets.items() if exp <= now]:
+            del _used_tickets[jti]
+        if not claims.get("jti") or claims["jti"] in _used_tickets:
+            raise HTTPException(status_code=401, detail="Ticket already used")
+        _used_tickets[claims["jti"]] = float(claims["exp"])
+
+def _authorize_stream(token: str, purpose: Optional[str]):
+    db = SessionLocal()
+    try:
+        user = user_from_token(token, db, purpose)
+        if purpose is not None: _redeem_ticket(token)
+        generation = _scope_generation
+        return user.id, cached_scope(user, db), generation
+    finally:
+        db.close()
+
+def _reload_stream_scope(user_id: str):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None or not user.is_active:
+            return False, None
+        return True, cached_scope(user, db)
+    finally:
+        db.close()
+
+def format_event(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+@app.post("/events/ticket")
+def issue_stream_ticket(current_user: User = Depends(get_current_user)):
+    return {"ticket": create_stream_ticket(current_user), "expiresIn": EVENT_TICKET_SECONDS}
+
+@app.get("/events")
+async def stream_events(request: Request, ticket: Optional[str] = None, lastEventId: Optional[str] = None):
+    # EventSource cannot set headers, so browsers pass a single-use ticket from POST /events/ticket
+    # instead of their access token, which would otherwise end up in access logs
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        user_id, scope, generation = await run_in_threadpool(_authorize_stream, auth[7:], None)
+    elif ticket:
+        user_id, scope, generation = await run_in_threadpool(_authorize_stream, ticket, STREAM_TICKET_PURPOSE)
+    else:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    sub, missed = change_broker.subscribe(scope, generation, request.headers.get("last-event-id") or lastEventId)
+
+    async def stream():
+        resolved_at = time.monotonic()
+        pending = deque(missed)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if pending:
+                    event = pending.popleft()
+                elif sub.overflowed and sub.queue.empty():
+                    # Dropped events are replayed from the backlog when the client reconnects
+                    break
+                else:
+                    try:
+                        event = await asyncio.wait_for(sub.queue.get(), EVENT_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+                if sub.generation != _scope_generation or time.monotonic() - resolved_at >= SCOPE_CACHE_TTL:
+                    generation, resolved_at = _scope_generation, time.monotonic()
+                    active, sub.scope = await run_in_threadpool(_reload_stream_scope, user_id)
+                    sub.generation = generation
+                    if not active: break
+                if event["type"] == "reset" or sub.scope is None or sub.scope.allows(event["actor_id"], event["subject_id"]):
+                    yield format_event(event)
+        finally:
+            change_broker.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
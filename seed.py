@@ -0,0 +1,218 @@
+"""Synthetic club generator for benchmarks and load tests.
+
+Fills the schema with a deterministic club (same --seed, same data) using bulk
+inserts. Every generated account logs in with the password "password".
+
+    python seed.py --database-url sqlite:///./bench.db --players 400 --years 3 --reset
+"""
+import os
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+SEED_PASSWORD = "password"
+BATCH_SIZE = 5000
+WEEKS_PER_MONTH = 4
+
+# Bulk assignment flows used by the admin UI; each template rotates through all of them week by week
+FLOWS = ["PLAYERS_TO_COACHES", "COACHES_TO_PLAYERS", "GUARDIANS_TO_CHILDREN", "GUARDIANS_TO_COACHES", "DOCTORS_TO_PLAYERS"]
+POSITIONS = ["GK", "CB", "FB", "DM", "CM", "AM", "W", "ST"]
+
+
+def _template(n: int) -> Dict[str, Any]:
+    categories = []
+    weights = [40, 30, 30]
+    for c in range(3):
+        categories.append({
+            "id": f"c-{n}-{c}",
+            "name": f"Category {c + 1}",
+            "arName": f"الفئة {c + 1}",
+            "weight": weights[c],
+            "questions": [
+                {"id": f"q-{n}-{c}-{q}", "text": f"Question {q + 1}", "arText": f"السؤال {q + 1}", "weight": w, "type": "RATING"}
+                for q, w in enumerate([34, 33, 33])
+            ]
+        })
+    return {
+        "id": f"t-{n:08x}",
+        "name": f"Template {n + 1}",
+        "ar_name": f"النموذج {n + 1}",
+        "description": "Synthetic benchmark template",
+        "ar_description": "نموذج اختبار الأداء",
+        "categories": categories
+    }
+
+
+def _answer(template: Dict[str, Any], rng: random.Random):
+    # Mirrors calculateWeightedScore in SurveyForm.tsx
+    answers = {}
+    total = 0.0
+    for category in template["categories"]:
+        raw = 0.0
+        for q in category["questions"]:
+            answers[q["id"]] = rng.randint(1, 10)
+            raw += (answers[q["id"]] / 10) * q["weight"]
+        total += raw * category["weight"] / 100
+    return answers, float(round(total))
+
+
+def _insert(db, model, rows: List[Dict[str, Any]]):
+    for i in range(0, len(rows), BATCH_SIZE):
+        db.execute(model.__table__.insert(), rows[i:i + BATCH_SIZE])
+    rows.clear()
+
+
+def generate_club(db, trainers: int = 8, players: int = 160, guardians: int = 160, doctors: int = 2,
+                  templates: int = 4, years: int = 2, first_year: int = 2023, completion: float = 0.8,
+                  sessions_per_week: int = 2, seed: int = 42) -> Dict[str, Any]:
+    """Populate an empty database and return the generated ids grouped by kind."""
+    from main import User, UserRole, SurveyTemplateModel, SurveyAssignment, SurveyResponse, TrainingSession, TrainingEvaluation, get_password_hash
+
+    rng = random.Random(seed)
+    password_hash = get_password_hash(SEED_PASSWORD)
+    counter = {"n": 0}
+
+    def next_id(prefix: str) -> str:
+        counter["n"] += 1
+        return f"{prefix}-{counter['n']:08x}"
+
+    def user_row(role: UserRole, n: int, **extra) -> Dict[str, Any]:
+        row = {
+            "id": next_id("u"), "name": f"{role.value.title()} {n + 1}", "email": f"{role.value.lower()}{n + 1}@club.test",
+            "password_hash": password_hash, "mobile": f"+9665{rng.randint(10000000, 99999999)}", "role": role,
+            "avatar": None, "trainer_id": None, "player_id": None, "player_ids": None, "position": None, "is_active": True
+        }
+        row.update(extra)
+        return row
+
+    admin = user_row(UserRole.ADMIN, 0)
+    trainer_rows = [user_row(UserRole.TRAINER, n) for n in range(trainers)]
+    player_rows = [
+        user_row(UserRole.PLAYER, n, trainer_id=trainer_rows[n % trainers]["id"] if trainers else None, position=rng.choice(POSITIONS))
+        for n in range(players)
+    ]
+    guardian_rows = [user_row(UserRole.GUARDIAN, n, player_id=player_rows[n % players]["id"]) for n in range(guardians if players else 0)]
+    doctor_rows = []
+    for n in range(doctors):
+        served = [p["id"] for i, p in enumerate(player_rows) if i % doctors == n]
+        doctor_rows.append(user_row(UserRole.DOCTOR, n, player_ids=served))
+    summary = {
+        "admin": admin["id"],
+        "trainers": [u["id"] for u in trainer_rows],
+        "players": [u["id"] for u in player_rows],
+        "guardians": [u["id"] for u in guardian_rows],
+        "doctors": [u["id"] for u in doctor_rows],
+    }
+    users = [admin] + trainer_rows + player_rows + guardian_rows + doctor_rows
+    user_map = {u["id"]: u for u in users}
+    _insert(db, User, list(users))
+
+    template_rows = [_template(n) for n in range(templates)]
+    summary["templates"] = [t["id"] for t in template_rows]
+    _insert(db, SurveyTemplateModel, list(template_rows))
+
+    pairs_by_flow = {
+        "PLAYERS_TO_COACHES": [(p["id"], p["trainer_id"]) for p in player_rows if p["trainer_id"]],
+        "COACHES_TO_PLAYERS": [(p["trainer_id"], p["id"]) for p in player_rows if p["trainer_id"]],
+        "GUARDIANS_TO_CHILDREN": [(g["id"], g["player_id"]) for g in guardian_rows],
+        "GUARDIANS_TO_COACHES": [(g["id"], user_map[g["player_id"]]["trainer_id"]) for g in guardian_rows if user_map[g["player_id"]]["trainer_id"]],
+        "DOCTORS_TO_PLAYERS": [(d["id"], p_id) for d in doctor_rows for p_id in d["player_ids"]],
+    }
+
+    assignments: List[Dict[str, Any]] = []
+    responses: List[Dict[str, Any]] = []
+    sessions: List[Dict[str, Any]] = []
+    evaluations: List[Dict[str, Any]] = []
+    summary["sessions"] = []
+    rosters = {t["id"]: [p["id"] for p in player_rows if p["trainer_id"] == t["id"]] for t in trainer_rows}
+    counts = {"assignments": 0, "responses": 0, "sessions": 0, "evaluations": 0}
+
+    def flush():
+        # Parents before children so foreign keys hold on Postgres
+        for key, model, rows in (("assignments", SurveyAssignment, assignments), ("responses", SurveyResponse, responses),
+                                 ("sessions", TrainingSession, sessions), ("evaluations", TrainingEvaluation, evaluations)):
+            counts[key] += len(rows)
+            _insert(db, model, rows)
+
+    week_index = 0
+    for year in range(first_year, first_year + years):
+        for month in range(1, 13):
+            for week in range(1, WEEKS_PER_MONTH + 1):
+                week_date = datetime(year, month, 1 + 7 * (week - 1), 17, 0)
+                for i, template in enumerate(template_rows):
+                    # Offset by week so every flow shows up even with a single template
+                    for r_id, t_id in pairs_by_flow[FLOWS[(i + week_index) % len(FLOWS)]]:
+                        completed = rng.random() < completion
+                        assignments.append({
+                            "id": next_id("a"), "template_id": template["id"], "assigner_id": admin["id"],
+                            "respondent_id": r_id, "target_id": t_id, "month": f"{month:02d}", "year": year, "week": week,
+                            "status": "COMPLETED" if completed else "PENDING"
+                        })
+                        if completed:
+                            answers, score = _answer(template, rng)
+                            responses.append({
+                                "id": next_id("sr"), "template_id": template["id"], "user_id": r_id, "target_player_id": t_id,
+                                "month": f"{month:02d}", "year": year, "week": week, "date": week_date,
+                                "answers": answers, "weighted_score": score
+                            })
+                for trainer in trainer_rows:
+                    roster = rosters[trainer["id"]]
+                    for s in range(sessions_per_week):
+                        session = {"id": next_id("ts"), "date": week_date + timedelta(days=s * 2), "trainer_id": trainer["id"], "player_ids": roster}
+                        sessions.append(session)
+                        summary["sessions"].append(session["id"])
+                        for p_id in roster:
+                            evaluations.append({
+                                "id": next_id("te"), "training_session_id": session["id"], "player_id": p_id,
+                                "rating": rng.randint(4, 10), "comments": None
+                            })
+                week_index += 1
+                if len(assignments) + len(responses) + len(evaluations) >= BATCH_SIZE:
+                    flush()
+    flush()
+    db.commit()
+    summary["counts"] = dict(counts, users=len(users), templates=len(template_rows))
+    return summary
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="Generate a synthetic FootPulse club")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./footpulse_seed.db"))
+    parser.add_argument("--trainers", type=int, default=8)
+    parser.add_argument("--players", type=int, default=160)
+    parser.add_argument("--guardians", type=int, default=160)
+    parser.add_argument("--doctors", type=int, default=2)
+    parser.add_argument("--templates", type=int, default=4)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--first-year", type=int, default=2023)
+    parser.add_argument("--completion", type=float, default=0.8, help="Share of assignments that have a response")
+    parser.add_argument("--sessions-per-week", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    # main.py reads DATABASE_URL and creates the schema at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    import main as app_main
+
+    if args.reset:
+        app_main.Base.metadata.drop_all(bind=app_main.engine)
+        app_main.init_db()
+    db = app_main.SessionLocal()
+    try:
+        if db.query(app_main.User).first() is not None:
+            parser.error("database already contains users; pass --reset to replace them")
+        summary = generate_club(
+            db, trainers=args.trainers, players=args.players, guardians=args.guardians, doctors=args.doctors,
+            templates=args.templates, years=args.years, first_year=args.first_year, completion=args.completion,
+            sessions_per_week=args.sessions_per_week, seed=args.seed
+        )
+    finally:
+        db.close()
+    for key, count in summary["counts"].items():
+        print(f"{key}: {count}")
+
+
+if __name__ == "__main__":
+    cli()